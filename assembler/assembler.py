@@ -10,7 +10,7 @@ from instructions.operands import get_operand_opcode
 from utils import utils
 from utils.errors import AldebaranError
 from utils.executable import Executable
-from .macros import MACRO_SET, MacroError, VariableError, ScopeError
+from .macros import MACRO_SET, MACRO_DISPATCH, MacroError, VariableError, ScopeError
 from .tokenizer import Tokenizer, Token, TokenType, Reference, ARGUMENT_TYPES, LABEL_REFERENCE_TYPES
 
 
@@ -224,12 +224,11 @@ class Assembler:
         return opcode
 
     def _parse_macro(self, macro_name, args, source_line, line_number):
-        try:
-            macro_class = MACRO_SET[macro_name]
-        except KeyError:
+        macro_spec = MACRO_DISPATCH.get(macro_name)
+        if macro_spec is None:
             _raise_error(source_line, line_number, None, 'Unknown macro: {}'.format(macro_name), MacroError)
-        macro = macro_class(self, source_line, line_number)
-        return macro.run(args)
+        params = macro_spec.prepare_params(self, args, source_line, line_number)
+        return macro_spec.do(self, params, source_line, line_number)
 
     def _parse_operands(self, args, source_line, line_number, opcode_pos):
         operands = []
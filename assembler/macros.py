@@ -3,6 +3,8 @@ Assembler macros
 '''
 
 import logging
+import sys
+from collections import namedtuple
 
 from instructions.operands import get_operand_opcode
 from utils import utils
@@ -13,6 +15,13 @@ from .tokenizer import Token, TokenType, Reference
 logger = logging.getLogger(__name__)
 
 
+# Token types used in hot loops, bound once as module globals.
+# TokenType members are singletons, so they are compared by identity.
+_STRING_LITERAL = TokenType.STRING_LITERAL
+_BYTE_LITERAL = TokenType.BYTE_LITERAL
+_VARIABLE = TokenType.VARIABLE
+
+
 class Macro:
     '''
     Macro base class
@@ -23,65 +32,69 @@ class Macro:
     param_types = None
     param_type_list = None
 
-    def __init__(self, assembler, source_line, line_number):
-        self.assembler = assembler
-        self.source_line = source_line
-        self.line_number = line_number
-        self.name = self.__class__.__name__
-
-    def run(self, params):
+    def __init_subclass__(cls, **kwargs):
+        # Precompute everything prepare_params() needs once per class instead of once per line:
+        # type lists become frozensets, parameter numbers become 0-based indices.
+        super().__init_subclass__(**kwargs)
+        min_param_count, max_param_count = cls.param_count
+        cls.min_param_count = 0 if min_param_count is None else min_param_count
+        cls.max_param_count = sys.maxsize if max_param_count is None else max_param_count
+        if cls.param_types is not None:
+            cls.param_types = tuple(frozenset(type_list) for type_list in cls.param_types)
+        if cls.param_type_list is not None:
+            cls.param_type_list = frozenset(cls.param_type_list)
+        substitute = cls.__dict__.get('substitute_variables_in_params')
+        if substitute is not None and substitute != 'all':
+            cls.substitute_variables_in_params = frozenset(param_number - 1 for param_number in substitute)
+
+    # Macros are never instantiated: the assembler calls the classmethods directly,
+    # source_line and line_number are only passed along for error reporting.
+
+    @classmethod
+    def prepare_params(cls, assembler, params, source_line, line_number):
         '''
-        Validate parameters, run macro, return generated opcode
+        Validate parameters and substitute variables, return parameters ready for do()
         '''
         # Validate parameter count
-        min_param_count, max_param_count = self.param_count
-        if not ((min_param_count is None or min_param_count <= len(params)) and (max_param_count is None or len(params) <= max_param_count)):
-            error_message = "Expected "
-            if min_param_count == max_param_count:
-                error_message += f"{min_param_count} params"
-            elif max_param_count is None:
-                error_message += f"at least {min_param_count} params"
+        param_count = len(params)
+        if param_count < cls.min_param_count or param_count > cls.max_param_count:
+            error_message = f"Expected {_param_count_string(cls.param_count)}, got {param_count}"
+            _raise_error(source_line, line_number, params[0].pos if params else None, error_message, MacroError)
+
+        # Substitute variables in parameters if necessary, touching only the targeted slots
+        substitute = cls.substitute_variables_in_params
+        if substitute:
+            substitute_variable = assembler.substitute_variable
+            variable = _VARIABLE
+            if substitute == 'all':
+                params = [substitute_variable(p, source_line, line_number) if p.type is variable else p for p in params]
             else:
-                error_message += f"{min_param_count}-{max_param_count} params"
-            error_message += f", got {len(params)}"
-            self._raise_macro_error(params[0].pos if params else None, error_message)
-        
-        # Substitute variables in parameters if necessary
-        if self.substitute_variables_in_params == 'all':
-            params = [self.assembler.substitute_variable(p, self.source_line, self.line_number) if p.type == TokenType.VARIABLE else p for p in params]
-        elif self.substitute_variables_in_params:
-            params = [self.assembler.substitute_variable(p, self.source_line, self.line_number) if i+1 in self.substitute_variables_in_params and p.type == TokenType.VARIABLE else p for i, p in enumerate(params)]
-
-        # Validate each parameter against type lists
-        for i, param in enumerate(params):
-            if self.param_types and i < len(self.param_types):
-                self._validate_parameter(param, self.param_types[i], param_number=i)
-            elif self.param_type_list and param.type not in self.param_type_list:
-                self._raise_macro_error(param.pos, f"Param {i} expected type in {self.param_type_list}, got {param.type}")
-
-        return self.do(params)
-
-    def do(self, params):
+                params = list(params)
+                for i in substitute:
+                    if i < param_count and params[i].type is variable:
+                        params[i] = substitute_variable(params[i], source_line, line_number)
+
+        # Validate each parameter against type sets
+        param_types = cls.param_types
+        if param_types:
+            for i, (param, type_set) in enumerate(zip(params, param_types)):
+                if param.type not in type_set:
+                    _raise_error(source_line, line_number, param.pos, f"Param {i} expected type in {_type_set_string(type_set)}, got {param.type}", MacroError)
+        param_type_list = cls.param_type_list
+        if param_type_list:
+            for i in range(len(param_types) if param_types else 0, param_count):
+                if params[i].type not in param_type_list:
+                    _raise_error(source_line, line_number, params[i].pos, f"Param {i} expected type in {_type_set_string(param_type_list)}, got {params[i].type}", MacroError)
+
+        return params
+
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
         '''
         Run macro, return generated opcode
         '''
         raise NotImplementedError("Subclasses must implement this method.")
 
-    def _validate_parameter(self, param, param_type_list, param_number=None):
-        if not param:
-            self._raise_macro_error(None, "Parameter is None")
-        if param.type not in param_type_list:
-            self._raise_macro_error(
-                param.pos,
-                f"Param {param_number} expected type in {param_type_list}, got {param.type}"
-            )
-
-    def _raise_macro_error(self, position, message):
-        self._raise_error(position, message, MacroError)
-
-    def _raise_error(self, position, message, error_type=AldebaranError):
-        _raise_error(self.source_line, self.line_number, position, message, error_type)
-
 
 class DAT(Macro):
     '''
@@ -94,18 +107,20 @@ class DAT(Macro):
     substitute_variables_in_params = 'all'
     param_type_list = [TokenType.BYTE_LITERAL, TokenType.WORD_LITERAL, TokenType.STRING_LITERAL]
 
-    def do(self, params):
-        opcode = []
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
+        opcode = bytearray()
         for param in params:
             # Depending on the type of param, we generate appropriate opcode.
-            if param.type == TokenType.STRING_LITERAL:
+            param_type = param.type
+            if param_type is _STRING_LITERAL:
                 # String literals are UTF-8 encoded
-                opcode.extend(param.value.encode('utf-8'))
-            elif param.type == TokenType.BYTE_LITERAL:
+                opcode += param.value.encode('utf-8')
+            elif param_type is _BYTE_LITERAL:
                 opcode.append(param.value)
-                # Else, it is a Word Literal
             else:
-                opcode.extend(utils.word_to_binary(param.value)) # Assuming there is a method to convert words to binary, we have to confirm.
+                # Else, it is a Word Literal
+                opcode += utils.word_to_bytes(param.value)
         return opcode
 
 
@@ -123,19 +138,21 @@ class DATN(Macro):
         [TokenType.BYTE_LITERAL, TokenType.WORD_LITERAL, TokenType.STRING_LITERAL],
     ]
 
-    def do(self, params):
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
         # Same as DAT, but this is multiplied N times
-        opcodeN = []
+        repeat, value = params
         # Depending on the type of param, we generate appropriate opcode and multiply it with N
-        if params[1].type == TokenType.STRING_LITERAL:
+        if value.type is _STRING_LITERAL:
             # String literals are UTF-8 encoded
-            opcodeN = list(params[1].value.encode('utf-8'))
-        elif params[1].type == TokenType.BYTE_LITERAL:
-            opcodeN.append(params[1].value)
-            # Else, it is a Word Literal
+            unit = value.value.encode('utf-8')
+        elif value.type is _BYTE_LITERAL:
+            unit = bytes((value.value,))
         else:
-            opcodeN = list(utils.word_to_binary(params[1].value)) # Assuming there is a method to convert words to binary, we have to confirm.
-        return opcodeN * params[0].value
+            # Else, it is a Word Literal
+            unit = utils.word_to_bytes(value.value)
+        return unit * repeat.value
+
 
 class CONST(Macro):
     '''
@@ -151,17 +168,19 @@ class CONST(Macro):
         [TokenType.BYTE_LITERAL, TokenType.WORD_LITERAL, TokenType.STRING_LITERAL],
     ]
 
-    def do(self, params):
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
         # In assembly language, variable declaration in this context doesn't translate into actual
         # machine code but rather informs the assembler how to substitute the variable in the code.
         const_name, const_value = params[0], params[1]
-        if const_name.type != TokenType.VARIABLE:
-            self._raise_error(const_name.pos, f"Expected a variable, got {const_name.type}", VariableError)
+        if const_name.type is not _VARIABLE:
+            _raise_error(source_line, line_number, const_name.pos, f"Expected a variable, got {const_name.type}", VariableError)
         # Check if the constant is being redefined, which should not happen
-        if self.assembler.is_variable_defined(const_name.value):
-            self._raise_error(const_name.pos, f"Constant {const_name.value} is already defined", VariableError)
-        # Register the constant in the assembler and return an empty opcode since CONST doesn't translate directly to machine code
-        self.assembler.consts[const_name.value] = const_value
+        if assembler.is_variable_defined(const_name.value):
+            _raise_error(source_line, line_number, const_name.pos, f"Constant {const_name.value} is already defined", VariableError)
+        # Register the constant in the assembler and return an empty opcode since CONST doesn't translate directly to machine code.
+        # It has to be registered right away (not batched at the end of the pass): following lines substitute it.
+        assembler.consts[const_name.value] = const_value
         return []
 
 
@@ -178,17 +197,18 @@ class PARAM(Macro):
         [TokenType.VARIABLE],
     ]
 
-    def do(self, params):
-        if self.assembler.current_scope is None:
-            self._raise_macro_error(params[0].pos, 'No scope defined for parameters.')
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
+        if assembler.current_scope is None:
+            _raise_error(source_line, line_number, params[0].pos, 'No scope defined for parameters.', MacroError)
             
         param_name = params[0]
-        if self.assembler.is_variable_defined(param_name.value):
-            self._raise_error(param_name.pos, f"Expected a variable for parameter, got {param_name.type}", VariableError)
+        if assembler.is_variable_defined(param_name.value):
+            _raise_error(source_line, line_number, param_name.pos, f"Expected a variable for parameter, got {param_name.type}", VariableError)
         try:
-            self.assembler.current_scope.add_parameter(param_name.value, self.length)
-        except:
-            self._raise_error(None, "Error adding parameter to the Scope", ScopeError)
+            assembler.current_scope.add_parameter(param_name.value, cls.length)
+        except ScopeError as ex:
+            _raise_error(source_line, line_number, None, f"Error adding parameter to the Scope: {ex}", ScopeError)
         return []
 
 
@@ -215,10 +235,12 @@ class VAR(Macro):
     param_types = [
         [TokenType.VARIABLE],
     ]
+    default_value_types = frozenset([TokenType.WORD_LITERAL, TokenType.BYTE_LITERAL])
 
-    def do(self, params):
-        if self.assembler.current_scope is None:
-            self._raise_macro_error(params[0].pos, 'No scope defined for variables.')
+    @classmethod
+    def do(cls, assembler, params, source_line, line_number):
+        if assembler.current_scope is None:
+            _raise_error(source_line, line_number, params[0].pos, 'No scope defined for variables.', MacroError)
 
         name = params[0]
         default_value = None
@@ -226,23 +248,23 @@ class VAR(Macro):
 
         if len(params) > 1:
             default_value = params[1]
-            if default_value.type == TokenType.VARIABLE:
+            if default_value.type is _VARIABLE:
                 # Substitute the variable to its value
-                default_value = self.assembler.substitute_variable(default_value, self.source_line, self.line_number)
-            if default_value.type not in {TokenType.WORD_LITERAL, TokenType.BYTE_LITERAL}:
-                self._raise_macro_error(default_value.pos, f'Invalid default value type: {default_value.type}')
+                default_value = assembler.substitute_variable(default_value, source_line, line_number)
+            if default_value.type not in cls.default_value_types:
+                _raise_error(source_line, line_number, default_value.pos, f'Invalid default value type: {default_value.type}', MacroError)
         try:
-            self.assembler.current_scope.add_variable(name.value, self.length)
-        except:
-            self._raise_error(None, "Error adding variable to the Scope", ScopeError)
+            assembler.current_scope.add_variable(name.value, cls.length)
+        except ScopeError as ex:
+            _raise_error(source_line, line_number, None, f"Error adding variable to the Scope: {ex}", ScopeError)
 
         # Get the instruction opcode
-        inst_opcode, inst = self.assembler.instruction_mapping['MOV']
+        inst_opcode, inst = assembler.instruction_mapping['MOV']
         
         if default_value:
             # We would return a reference token for the default value.
             opcode += [inst_opcode]
-            scope_value = self.assembler.current_scope.get_value(name.value)
+            scope_value = assembler.current_scope.get_value(name.value)
             opcode += get_operand_opcode(scope_value)
             opcode += get_operand_opcode(Token(default_value.type, default_value.value, None))
         
@@ -271,16 +293,45 @@ MACRO_SET = {
 }
 
 
+MacroSpec = namedtuple('MacroSpec', [
+    'prepare_params',  # bound cls.prepare_params, resolved once instead of per line
+    'do',  # bound cls.do, resolved once instead of per line
+])
+
+
+MACRO_DISPATCH = {
+    name: MacroSpec(macro_class.prepare_params, macro_class.do)
+    for name, macro_class in MACRO_SET.items()
+}
+
+
+ERROR_MESSAGE_FORMAT = 'Error at line %s, pos %s: %s'
+
+
 def _raise_error(code, line_number, pos, error_message, exception):
     """
     Raise specific error class with detailed information.
     """
-    full_message = f"Error at line {line_number}, pos {pos}: {error_message}"
-    raise exception(full_message)
+    raise exception(ERROR_MESSAGE_FORMAT % (line_number, pos, error_message))
 
 
 def _param_count_string(cnt):
-    pass
+    """
+    Describe an expected (min, max) parameter count, e.g. "1-2 params".
+    """
+    min_param_count, max_param_count = cnt
+    if min_param_count == max_param_count:
+        return f"{min_param_count} params"
+    if max_param_count is None:
+        return f"at least {min_param_count} params"
+    return f"{min_param_count}-{max_param_count} params"
+
+
+def _type_set_string(type_set):
+    """
+    Describe a set of token types in TokenType declaration order, e.g. "[STRING_LITERAL, BYTE_LITERAL]".
+    """
+    return '[{}]'.format(', '.join(token_type.name for token_type in sorted(type_set, key=lambda token_type: token_type.value)))
 
 
 # pylint: disable=missing-docstring
@@ -59,6 +59,7 @@ Token types:
 
 import ast
 import re
+import sys
 from collections import namedtuple
 from enum import Enum
 import logging
@@ -144,7 +145,11 @@ class Tokenizer:
     '''
 
     def __init__(self, keywords):
-        self.keywords = keywords
+        self.keywords = dict(keywords)
+        # Instruction and macro names are only used for membership tests (once per
+        # identifier/macro token), so look them up in sets instead of scanning lists
+        for names in ('instruction_names', 'macro_names'):
+            self.keywords[names] = frozenset(keywords[names])
         self.token_rules = self._get_token_rules()
         self.tokenizer_regex = re.compile(r'|'.join(
             r'(?P<{}>{})'.format(token_rule.case, token_rule.regex)
@@ -282,6 +287,9 @@ Rule = namedtuple('Rule', [
 class CaseHandler:
     '''
     Handle cases of the tokenizer regex
+
+    Label and variable names are interned, so every occurrence of a name shares one
+    string object and the assembler's label/const dict lookups hit by identity.
     '''
 
     def __init__(self, code, match, keywords):
@@ -311,7 +319,7 @@ class CaseHandler:
     def _case_label(self):
         return Case(
             TokenType.LABEL,
-            self._get_subgroup_value('label_value'),
+            sys.intern(self._get_subgroup_value('label_value')),
         )
 
     def _case_string_literal(self):
@@ -341,7 +349,7 @@ class CaseHandler:
     def _case_variable(self):
         return Case(
             TokenType.VARIABLE,
-            self.original_value,
+            sys.intern(self.original_value),
         )
 
     def _case_system_variable(self):
@@ -359,7 +367,7 @@ class CaseHandler:
     def _case_address_label(self):
         return Case(
             TokenType.ADDRESS_LABEL,
-            self._get_subgroup_value('address_label_value'),
+            sys.intern(self._get_subgroup_value('address_label_value')),
         )
 
     def _case_word_literal(self):
@@ -399,7 +407,7 @@ class CaseHandler:
         else:
             token_type = TokenType.IDENTIFIER
         if token_type == TokenType.IDENTIFIER:
-            token_value = self.original_value
+            token_value = sys.intern(self.original_value)
         else:
             token_value = self.raw_value
         return Case(
@@ -464,12 +472,12 @@ class CaseHandler:
         elif ref_type == 'word':
             base = int(base, 16)
         elif ref_type == 'label_reg':
-            base = self._get_subgroup_value(base_subgroup_name)
+            base = sys.intern(self._get_subgroup_value(base_subgroup_name))
         elif ref_type == 'label_byte':
-            base = self._get_subgroup_value(base_subgroup_name)
+            base = sys.intern(self._get_subgroup_value(base_subgroup_name))
             offset = int(offset, 16)
         elif ref_type == 'label':
-            base = self._get_subgroup_value(base_subgroup_name)
+            base = sys.intern(self._get_subgroup_value(base_subgroup_name))
         return Reference(base, offset, length)
 
     def _raise_error(self, error_message, exception):
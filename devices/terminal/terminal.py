@@ -2,6 +2,7 @@
 Primitive terminal device
 '''
 
+import sys
 from http import HTTPStatus
 
 from devices import device
@@ -12,6 +13,9 @@ DEVICE_TYPE = 0x01
 DEVICE_ID = 0xABCDEF
 DEVICE_CLASS = 'Terminal'
 
+ANSI_PREFIX = b'\033[0;36m'
+ANSI_SUFFIX = b'\033[0m\n'
+
 
 class Terminal(device.Device):
     '''
@@ -28,7 +32,17 @@ class Terminal(device.Device):
             self.send_text(text)
 
     def handle_data(self, data):
-        print('\033[0;36m%s\033[0m' % data.decode('utf-8'))
+        frame = ANSI_PREFIX + data + ANSI_SUFFIX
+        # Look stdout up per frame, it may be redirected or swapped at any time.
+        # Write to its binary buffer if possible: one write + one flush per frame.
+        stdout = sys.stdout
+        output = getattr(stdout, 'buffer', None)
+        if output is None:
+            stdout.write(frame.decode('utf-8', errors='replace'))
+            stdout.flush()
+        else:
+            output.write(frame)
+            output.flush()
         return (
             HTTPStatus.OK,
             {
@@ -1,5 +1,6 @@
 import logging
 import unittest
+from unittest.mock import patch
 
 from assembler.assembler import Assembler, AssemblerError, Scope, ScopeError
 from assembler.macros import MacroError, VariableError
@@ -101,6 +102,15 @@ class TestAssembler(unittest.TestCase):
         expected_opcode += [0x41, 0x42, 0x43, 0x41, 0x42, 0x43]
         self.assertListEqual(opcode, expected_opcode)
 
+    def test_macro_datn_large_repeat(self):
+        opcode = self.assembler.assemble_code('''
+        .DATN 0x1000 0x00
+        .DATN 0x0800 0xABCD
+        ''')
+        expected_opcode = [0x00] * 0x1000
+        expected_opcode += [0xAB, 0xCD] * 0x0800
+        self.assertListEqual(opcode, expected_opcode)
+
     def test_macro_dat_and_datn_error(self):
         with self.assertRaises(MacroError):
             self.assembler.assemble_code('''
@@ -135,6 +145,25 @@ class TestAssembler(unittest.TestCase):
             .DATN 0x00 a
             ''')
 
+    def test_macro_error_message(self):
+        with self.assertRaisesRegex(MacroError, r'^Error at line 2, pos 18: Expected 2 params, got 1$'):
+            self.assembler.assemble_code('''
+            .DATN 0x00
+            ''')
+        with self.assertRaisesRegex(MacroError, r'^Error at line 3, pos None: Expected at least 1 params, got 0$'):
+            self.assembler.assemble_code('''
+            NOP
+            .DAT
+            ''')
+        with self.assertRaisesRegex(MacroError, r'^Error at line 2, pos 18: Param 0 expected type in \[WORD_LITERAL, BYTE_LITERAL\], got TokenType.STRING_LITERAL$'):
+            self.assembler.assemble_code('''
+            .DATN 'a' 0x00
+            ''')
+        with self.assertRaisesRegex(MacroError, r'^Error at line 2, pos 22: Param 1 expected type in \[STRING_LITERAL, WORD_LITERAL, BYTE_LITERAL\], got TokenType.WORD_REGISTER$'):
+            self.assembler.assemble_code('''
+            .DAT 0x00 AX
+            ''')
+
     def test_macro_const(self):
         opcode = self.assembler.assemble_code('''
         .CONST $stuff 0x1234
@@ -247,6 +276,35 @@ class TestAssembler(unittest.TestCase):
             .PARAM $p
             .PARAM $p
             ''')
+        with self.assertRaisesRegex(ScopeError, r'Error adding variable to the Scope: Too many local variables$'):
+            self.assembler.assemble_code('''
+            ENTER 0x00 0x02
+            .VAR $v1
+            .VARB $v2
+            ''')
+        with self.assertRaisesRegex(ScopeError, r'Error adding parameter to the Scope: Too many parameters$'):
+            self.assembler.assemble_code('''
+            ENTER 0x01 0x00
+            .PARAM $p
+            ''')
+
+    def test_macro_param_and_var_unexpected_error(self):
+        # Only ScopeError is turned into a macro error, anything else propagates unchanged
+        error = RuntimeError('unexpected')
+        with patch.object(Scope, 'add_variable', side_effect=error):
+            with self.assertRaises(RuntimeError) as context:
+                self.assembler.assemble_code('''
+                ENTER 0x00 0x02
+                .VAR $v
+                ''')
+        self.assertIs(context.exception, error)
+        with patch.object(Scope, 'add_parameter', side_effect=error):
+            with self.assertRaises(RuntimeError) as context:
+                self.assembler.assemble_code('''
+                ENTER 0x02 0x00
+                .PARAM $p
+                ''')
+        self.assertIs(context.exception, error)
 
 
 class TestScope(unittest.TestCase):
@@ -0,0 +1,36 @@
+import io
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from devices.terminal import terminal
+
+
+class TestTerminal(unittest.TestCase):
+
+    def setUp(self):
+        with patch('sys.stdout', new=io.StringIO()):
+            self.terminal = terminal.Terminal(
+                ioport_number=0,
+                device_descriptor=(terminal.DEVICE_TYPE, terminal.DEVICE_ID),
+                aldebaran_address=('localhost', 0),
+                device_address=('localhost', 0),
+            )
+
+    def tearDown(self):
+        self.terminal._server.server_close()
+
+    def test_handle_data_binary_stdout(self):
+        output = io.BytesIO()
+        with patch('sys.stdout', new=io.TextIOWrapper(output)):
+            status, response = self.terminal.handle_data(b'hello')
+            self.assertEqual(output.getvalue(), b'\033[0;36mhello\033[0m\n')
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response['message'], 'Received data: 68 65 6C 6C 6F')
+
+    def test_handle_data_text_stdout(self):
+        output = io.StringIO()
+        with patch('sys.stdout', new=output):
+            status, _ = self.terminal.handle_data('héllo'.encode('utf-8'))
+        self.assertEqual(output.getvalue(), '\033[0;36mhéllo\033[0m\n')
+        self.assertEqual(status, HTTPStatus.OK)
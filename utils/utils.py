@@ -2,8 +2,10 @@
 Utils, like binary_to_number, set_low, set_high...
 '''
 
+import functools
 import json
 import logging
+import struct
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
 from .errors import AldebaranError
@@ -16,13 +18,31 @@ def binary_to_number(binary, signed=False):
     return int.from_bytes(binary, 'big', signed=signed)
 
 
+_WORD_STRUCT = struct.Struct('>H')
+_SIGNED_WORD_STRUCT = struct.Struct('>h')
+
+
 def word_to_binary(word, signed=False):
     '''
     Convert word-length number to binary (list of bytes)
     '''
     try:
-        return list(word.to_bytes(2, 'big', signed=signed))
-    except OverflowError:
+        return list((_SIGNED_WORD_STRUCT if signed else _WORD_STRUCT).pack(word))
+    except struct.error:
+        raise WordOutOfRangeError(hex(word))
+
+
+@functools.lru_cache(maxsize=4096)
+def word_to_bytes(word, signed=False):
+    '''
+    Convert word-length number to bytes
+
+    Used for .DAT/.DATN emission, where sources reuse the same words a lot, hence the
+    cache. Runtime code (instructions, operands) uses the uncached word_to_binary.
+    '''
+    try:
+        return (_SIGNED_WORD_STRUCT if signed else _WORD_STRUCT).pack(word)
+    except struct.error:
         raise WordOutOfRangeError(hex(word))
 
 